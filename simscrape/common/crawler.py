@@ -1,11 +1,17 @@
 """
 Common shared crawler implementations
 """
+import asyncio
 import re
+from typing import List
 import aiohttp
 from pydantic import BaseModel
 from simscrape.common.markdown import DefaultMarkdownGenerator
 
+# Compiled once at import so per-page cleanup avoids pattern lookups
+_BLANK_LINES = re.compile(r'\n\s*\n')
+_LINE_EDGE_WS = re.compile(r'^[ \t]+|[ \t]+$', re.MULTILINE)
+
 class BrowserConfig(BaseModel):
     """Configuration for browser behavior"""
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -25,13 +31,18 @@ class CrawlResult(BaseModel):
 
     def clean_markdown(self) -> str:
         """Clean up the markdown content by removing excessive whitespace"""
-        cleaned = re.sub(r'\n\s*\n', '\n\n', self.markdown)
-        cleaned = '\n'.join(line.strip() for line in cleaned.splitlines())
-        cleaned = cleaned.strip()
-        return cleaned
+        cleaned = _BLANK_LINES.sub('\n\n', self.markdown)
+        cleaned = _LINE_EDGE_WS.sub('', cleaned)
+        return cleaned.strip()
 
 class AsyncWebCrawler:
-    """Asynchronous web crawler with session management"""
+    """Asynchronous web crawler with session management.
+
+    Instantiate once and reuse across calls: the underlying aiohttp session
+    keeps a connection pool, so reusing the crawler avoids paying the TCP/TLS
+    handshake on every request to the same host. The session is created
+    lazily on first use and closed by `__aexit__` or an explicit `aclose()`.
+    """
 
     def __init__(self,
                  browser_config: BrowserConfig = None,
@@ -42,26 +53,43 @@ class AsyncWebCrawler:
         self.browser_config = browser_config or BrowserConfig()
         self.run_config = run_config or CrawlerRunConfig()
         self.markdown_generator = markdown_generator or DefaultMarkdownGenerator()
+        # Build once so repeated session (re)creation is allocation-free
+        self._headers = {"User-Agent": self.browser_config.user_agent}
+        self._timeout = aiohttp.ClientTimeout(total=self.browser_config.timeout)
 
-    async def __aenter__(self):
-        """Set up the aiohttp session when entering context"""
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared aiohttp session on first use"""
         if self.session is None:
             self.session = aiohttp.ClientSession(
-                headers={"User-Agent": self.browser_config.user_agent},
-                timeout=aiohttp.ClientTimeout(total=self.browser_config.timeout)
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=16,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                ),
+                headers=self._headers,
+                timeout=self._timeout
             )
+        return self.session
+
+    async def __aenter__(self):
+        """Set up the aiohttp session when entering context"""
+        self._ensure_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up the session when exiting context"""
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the shared session and release pooled connections"""
         if self.session:
             await self.session.close()
             self.session = None
 
     async def arun(self, url: str) -> CrawlResult:
         """Run the crawler on a single URL"""
-        if self.session is None:
-            raise RuntimeError("Crawler must be used within an async context manager")
+        self._ensure_session()
 
         try:
             async with self.session.get(url, ssl=self.browser_config.verify_ssl) as response:
@@ -75,3 +103,30 @@ class AsyncWebCrawler:
         except ValueError as e:
             print(f"Data processing error for {url}: {str(e)}")
             return CrawlResult(markdown="", html="")
+
+    async def arun_many(self, urls: List[str], concurrency: int = 16) -> List[CrawlResult]:
+        """Crawl many URLs concurrently, at most `concurrency` in flight.
+
+        Results are returned in the same order as `urls`. Failures become
+        empty CrawlResults: `arun` handles network and parsing errors, and
+        anything it lets through (e.g. a total-timeout asyncio.TimeoutError)
+        is caught here so one bad URL cannot discard the whole batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _bounded(url: str) -> CrawlResult:
+            async with semaphore:
+                return await self.arun(url)
+
+        results = await asyncio.gather(
+            *(_bounded(url) for url in urls),
+            return_exceptions=True,
+        )
+        crawl_results = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                print(f"Error crawling {url}: {str(result)}")
+                crawl_results.append(CrawlResult(markdown="", html=""))
+            else:
+                crawl_results.append(result)
+        return crawl_results
@@ -1,48 +1,50 @@
 """
 Filename generation utilities
 """
+import re
+from functools import lru_cache
 from urllib.parse import urlparse
-from typing import Optional
+from typing import Optional, Tuple
 
+# Characters that are invalid in filenames, replaced in one C-level scan
+_INVALID_CHARS = re.compile(r'[<>:"/\\|?*]')
+
+@lru_cache(maxsize=4096)
 def sanitize_filename(text: str) -> str:
     """Convert text to a valid filename."""
-    # Remove or replace invalid filename characters
-    invalid_chars = '<>:"/\\|?*'
-    filename = ''.join(c if c not in invalid_chars else '_' for c in text)
-    # Limit length and remove trailing spaces/dots
-    return filename[:50].strip('. ')
+    # Replace invalid filename characters, limit length, strip trailing spaces/dots
+    return _INVALID_CHARS.sub('_', text)[:50].strip('. ')
 
-def get_domain_prefix(url: str, default_prefix: str) -> str:
-    """Extract domain prefix from URL."""
+def _split_url(url: str, default_prefix: str) -> Tuple[str, Optional[str]]:
+    """Parse a URL once and return its (domain prefix, path suffix)."""
     try:
         parsed = urlparse(url)
         # Get domain parts and remove common prefixes
         domain_parts = parsed.netloc.split('.')
         if domain_parts[0] in ['www', 'docs', 'api']:
             domain_parts = domain_parts[1:]
-        return domain_parts[0] if domain_parts else default_prefix
+        prefix = domain_parts[0] if domain_parts else default_prefix
+
+        path_parts = [p for p in parsed.path.split('/') if p]
+        suffix = path_parts[-1] if path_parts else None
+        return prefix, suffix
     except (ValueError, AttributeError, IndexError) as e:
         print(f"URL parsing error: {str(e)}")
-        return default_prefix
+        return default_prefix, None
+
+def get_domain_prefix(url: str, default_prefix: str) -> str:
+    """Extract domain prefix from URL."""
+    return _split_url(url, default_prefix)[0]
 
 def get_path_suffix(url: str) -> Optional[str]:
     """Extract meaningful suffix from URL path."""
-    try:
-        parsed = urlparse(url)
-        path_parts = [p for p in parsed.path.split('/') if p]
-        return path_parts[-1] if path_parts else None
-    except (ValueError, AttributeError, IndexError) as e:
-        print(f"Path parsing error: {str(e)}")
-        return None
+    return _split_url(url, '')[1]
 
 def generate_filename(url: str, index: int, timestamp: str, default_prefix: str) -> str:
     """Generate a safe filename from URL components."""
     try:
-        # Get domain prefix (e.g., 'crawl4ai' from 'docs.crawl4ai.com')
-        prefix = get_domain_prefix(url, default_prefix)
-
-        # Get path suffix if available
-        suffix = get_path_suffix(url)
+        # Parse the URL once for both the domain prefix and path suffix
+        prefix, suffix = _split_url(url, default_prefix)
 
         # Combine prefix with suffix if available
         if suffix:
@@ -1,11 +1,30 @@
 """
 Markdown generation utilities
 """
-# import re
+import re
 from typing import Optional
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from pydantic import BaseModel
 
+# Splits extracted text on newlines and multi-space runs in one C-level pass
+_WS_SPLIT = re.compile(r'[ \t]{2,}|\n')
+
+# Matches the <title> element without building a document tree
+_TITLE_RE = re.compile(r'<title[^>]*>([^<]{0,512})</title>', re.IGNORECASE)
+
+def generate_title(html: str) -> Optional[str]:
+    """Extract the page title without parsing the full document.
+
+    A regex scan stops at the title element near the top of the page, so
+    callers that only need the title (e.g. filename generation) avoid the
+    O(document) tree build entirely.
+    """
+    match = _TITLE_RE.search(html)
+    if match:
+        return match.group(1).strip() or None
+    return None
+
 class MarkdownGenerationStrategy(BaseModel):
     """Base class for markdown generation strategies"""
     title: Optional[str] = None
@@ -19,15 +38,13 @@ class DefaultMarkdownGenerator(MarkdownGenerationStrategy):
     """Default strategy for converting HTML to markdown"""
     def generate_markdown(self, html: str) -> str:
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            tree = lxml.html.fromstring(html)
 
             # Extract title with error handling
             try:
-                title_tag = soup.find('title')
-                if title_tag:
-                    self.title = title_tag.get_text().strip()
-                    if len(self.title) == 0:
-                        self.title = None
+                title_tag = tree.find('.//title')
+                if title_tag is not None and title_tag.text:
+                    self.title = title_tag.text.strip() or None
                 else:
                     self.title = None
             except (AttributeError, TypeError) as e:
@@ -35,24 +52,19 @@ class DefaultMarkdownGenerator(MarkdownGenerationStrategy):
                 self.title = None
 
             # Remove script and style elements
-            for element in soup(['script', 'style']):
-                element.decompose()
+            etree.strip_elements(tree, 'script', 'style', with_tail=False)
 
             # Get text
-            text = soup.get_text() # original crawl4ai cleanup
-            # text = soup.get_text(separator='\n') # Get text preserving natural line breaks
-
-            # Clean up excessive whitespace while preserving line breaks
-            # lines = [line.strip() for line in text.splitlines() if line.strip()]
-            # self.markdown = '\n\n'.join(lines)
+            text = tree.text_content() # original crawl4ai cleanup
 
-            # Original crawl4ai cleanup the text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
+            # Original crawl4ai cleanup, fused into a single split/strip pass
+            text = '\n'.join(
+                stripped for chunk in _WS_SPLIT.split(text)
+                if (stripped := chunk.strip())
+            )
 
             return text
 
-        except (AttributeError, TypeError, ValueError) as e:
+        except (AttributeError, TypeError, ValueError, etree.ParserError) as e:
             print(f"Error in markdown generation: {str(e)}")
             return ""
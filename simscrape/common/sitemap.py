@@ -1,12 +1,14 @@
 """
 Sitemap crawler for extracting URLs from XML sitemaps
 """
+import asyncio
+import io
+import time
 from typing import List
 from xml.etree import ElementTree
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
-import time
-import requests
+import aiohttp
 
 # Default sitemap paths to check
 DEFAULT_SITEMAP_PATHS = [
@@ -17,53 +19,118 @@ DEFAULT_SITEMAP_PATHS = [
 ]
 
 class SitemapCrawler:
-    """Crawler for extracting URLs from XML sitemaps"""
-    
-    def __init__(self, base_url: str, paths: List[str] = None, headers: dict = None):
+    """Crawler for extracting URLs from XML sitemaps.
+
+    Uses a shared aiohttp session so sub-sitemaps of an index are fetched
+    concurrently over pooled connections. Use as an async context manager,
+    or call `aclose()` when done.
+    """
+
+    def __init__(self, base_url: str, paths: List[str] = None, headers: dict = None,
+                 concurrency: int = 8, min_interval: float = 0.0):
         self.base_url = base_url.rstrip('/')
         self.paths = paths or DEFAULT_SITEMAP_PATHS.copy()
-        self.namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        self.session = requests.Session()
-        
+        self.session = None
+        self.min_interval = min_interval  # Seconds to wait between requests per host
+        self._last_request = {}  # Per-host monotonic timestamp of the last request
+
         # Set default headers if none provided
         self.headers = headers or {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xml,application/xhtml+xml',
             'Accept-Language': 'en-US,en;q=0.9',
         }
-        self.session.headers.update(self.headers)
+        self._semaphore = asyncio.Semaphore(concurrency)
         self.found_urls = set()
+        self._visited_sitemaps = set()  # Guards against cyclic/duplicated sitemap links
+        self._robots_checked = False
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared aiohttp session on first use"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
+
+    async def __aenter__(self):
+        self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
 
-    def get_sitemap_urls(self) -> List[str]:
+    async def aclose(self):
+        """Close the shared session and release pooled connections"""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def _fetch(self, url: str, max_attempts: int = 3) -> bytes:
+        """Fetch a URL body, bounded by the shared semaphore.
+
+        Rate limiting is adaptive: requests proceed immediately unless the
+        server answers 429/503, in which case we honour its Retry-After
+        header (falling back to exponential backoff) and retry. An optional
+        `min_interval` enforces a per-host gap between requests.
+        """
+        async with self._semaphore:
+            session = self._ensure_session()
+            host = urlparse(url).netloc
+            for attempt in range(max_attempts):
+                if self.min_interval > 0:
+                    elapsed = time.monotonic() - self._last_request.get(host, 0.0)
+                    if elapsed < self.min_interval:
+                        await asyncio.sleep(self.min_interval - elapsed)
+                self._last_request[host] = time.monotonic()
+
+                async with session.get(url) as response:
+                    if response.status in (429, 503):
+                        retry_after = response.headers.get('Retry-After', '')
+                        delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+                        print(f"Rate limited by {host}, retrying in {delay}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    response.raise_for_status()
+                    return await response.read()
+
+            raise aiohttp.ClientError(f"Rate limited fetching {url} after {max_attempts} attempts")
+
+    async def get_sitemap_urls(self) -> List[str]:
         """Try different sitemap paths and collect all URLs."""
         # First, try to get sitemaps from robots.txt
-        self._add_robots_sitemaps()
-        
+        await self._add_robots_sitemaps()
+
         # Then try all known paths
         for path in self.paths:
             sitemap_url = urljoin(self.base_url, path)
             try:
-                urls = self._process_sitemap(sitemap_url)
+                urls = await self._process_sitemap(sitemap_url)
                 if urls:
                     print(f"Successfully found sitemap at: {sitemap_url}")
                     return list(urls)  # Convert set to list
             except Exception as e:
                 print(f"Failed to process sitemap at {sitemap_url}: {str(e)}")
-        
+
         if not self.found_urls:
             print("No sitemaps found at any of the standard locations")
         return list(self.found_urls)
 
-    def _add_robots_sitemaps(self) -> None:
+    async def _add_robots_sitemaps(self) -> None:
         """Check robots.txt for Sitemap directives and add them to paths."""
+        if self._robots_checked:
+            return
+        self._robots_checked = True
+
         robots_url = urljoin(self.base_url, "/robots.txt")
         try:
+            body = await self._fetch(robots_url)
             rp = RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
-            
+            rp.parse(body.decode('utf-8', errors='replace').splitlines())
+
             sitemap_urls = rp.site_maps()
-            
+
             if sitemap_urls:
                 print(f"Found {len(sitemap_urls)} sitemaps in robots.txt")
                 for sitemap in sitemap_urls:
@@ -72,55 +139,71 @@ class SitemapCrawler:
                         path = urlparse(sitemap).path
                     else:
                         path = sitemap
-                    
+
                     if path not in self.paths:
                         self.paths.append(path)
                         print(f"Added sitemap from robots.txt: {path}")
-            
+
         except Exception as e:
             print(f"Note: Could not process robots.txt ({str(e)})")
 
-    def _process_sitemap(self, sitemap_url: str) -> set:
+    @staticmethod
+    def _parse_sitemap(source) -> tuple:
+        """Stream-parse a sitemap from a file-like source.
+
+        Returns (is_index, locs) without ever building the full DOM:
+        each element is freed as soon as its <loc> text has been read,
+        so peak memory stays flat even for 50k-URL sitemaps.
+        """
+        is_index = None
+        locs = []
+        for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                if is_index is None:
+                    # The root tag tells us whether this is a sitemap index
+                    is_index = 'sitemapindex' in elem.tag
+                continue
+            if elem.tag.rsplit('}', 1)[-1] == 'loc' and elem.text:
+                locs.append(elem.text.strip())
+            elem.clear()
+        return bool(is_index), locs
+
+    async def _process_sitemap(self, sitemap_url: str) -> set:
         """Process a sitemap or sitemap index file."""
+        # Skip sitemaps we have already fetched — indexes can link the same
+        # sub-sitemap more than once, and malformed ones can form cycles
+        if sitemap_url in self._visited_sitemaps:
+            return set()
+        self._visited_sitemaps.add(sitemap_url)
+
         try:
-            time.sleep(2)  # Rate limiting
-            response = self.session.get(sitemap_url, timeout=30)
-            response.raise_for_status()
-            
-            if response.status_code == 403:
-                print(f"Access forbidden to {sitemap_url}. The site may be blocking automated access.")
-                return set()
-            
-            root = ElementTree.fromstring(response.content)
-            
+            body = await self._fetch(sitemap_url)
+            is_index, locs = self._parse_sitemap(io.BytesIO(body))
+
             # Check if this is a sitemap index
-            if 'sitemapindex' in root.tag:
-                return self._process_sitemap_index(root)
-            
+            if is_index:
+                return await self._process_sitemap_index(locs)
+
             # Regular sitemap
-            return self._extract_urls_from_sitemap(root)
-        except requests.exceptions.RequestException as e:
+            return {url for url in locs if self._is_valid_url(url)}
+        except aiohttp.ClientError as e:
             print(f"Error accessing {sitemap_url}: {str(e)}")
             return set()
 
-    def _process_sitemap_index(self, root: ElementTree.Element) -> set:
-        """Process a sitemap index file containing multiple sitemaps."""
+    async def _process_sitemap_index(self, sitemap_urls: List[str]) -> set:
+        """Process the sub-sitemap URLs from a sitemap index concurrently."""
         urls = set()
-        for sitemap in root.findall('.//ns:loc', self.namespace):
-            try:
-                sub_urls = self._process_sitemap(sitemap.text)
+        results = await asyncio.gather(
+            *(self._process_sitemap(sitemap) for sitemap in sitemap_urls),
+            return_exceptions=True,
+        )
+        for sitemap, sub_urls in zip(sitemap_urls, results):
+            if isinstance(sub_urls, Exception):
+                print(f"Error processing sub-sitemap {sitemap}: {str(sub_urls)}")
+            else:
                 urls.update(sub_urls)
-            except Exception as e:
-                print(f"Error processing sub-sitemap {sitemap.text}: {str(e)}")
         return urls
 
-    def _extract_urls_from_sitemap(self, root: ElementTree.Element) -> set:
-        """Extract URLs from a regular sitemap file."""
-        return {
-            loc.text for loc in root.findall('.//ns:loc', self.namespace)
-            if self._is_valid_url(loc.text)
-        }
-
     def _is_valid_url(self, url: str) -> bool:
         """Basic URL validation."""
         try:
@@ -129,13 +212,12 @@ class SitemapCrawler:
         except Exception:
             return False
 
-    def get_urls_from_sitemap(self, sitemap_url: str) -> set:
+    async def get_urls_from_sitemap(self, sitemap_url: str) -> set:
         """Process a specific sitemap URL and return its URLs."""
         try:
-            response = self.session.get(sitemap_url, timeout=30)
-            response.raise_for_status()
-            root = ElementTree.fromstring(response.content)
-            return self._extract_urls_from_sitemap(root)
+            body = await self._fetch(sitemap_url)
+            _, locs = self._parse_sitemap(io.BytesIO(body))
+            return {url for url in locs if self._is_valid_url(url)}
         except Exception as e:
             print(f"Error processing sitemap {sitemap_url}: {str(e)}")
-            return set() 
\ No newline at end of file
+            return set()
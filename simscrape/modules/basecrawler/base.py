@@ -6,10 +6,15 @@ Created and tested 15/02/2025
 import asyncio
 from pathlib import Path
 from datetime import datetime
+import logging
 import sys
 from simscrape.common.crawler import AsyncWebCrawler
 from simscrape.common.filename import generate_filename
 
+# Buffered logger instead of per-line stdout flushes in the crawl loop
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+logger = logging.getLogger(__name__)
+
 # variable for configuration
 URLS_TO_CRAWL = [
     #"https://immi.homeaffairs.gov.au/what-we-do/whm-program/latest-news",
@@ -43,42 +48,45 @@ async def main():
         # Generate timestamp for this batch
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        # Generate filenames up front (same convention as crawl-sequential.py)
+        # so the crawl loop only does network I/O and writes
+        per_url = [
+            (index, url, output_dir / generate_filename(url, index, timestamp, OUTPUT_FILE_PREFIX))
+            for index, url in enumerate(URLS_TO_CRAWL, start=1)
+        ]
+
         async with AsyncWebCrawler() as crawler:
             if not URLS_TO_CRAWL:
-                print("No URLs to crawl")
+                logger.error("No URLs to crawl")
                 return 1
-            for index, url in enumerate(URLS_TO_CRAWL, start=1):
+            for index, url, output_file in per_url:
                 try:
-                    print(f"\nProcessing {index}/{len(URLS_TO_CRAWL)}: {url}")
+                    logger.info("Processing %d/%d: %s", index, len(URLS_TO_CRAWL), url)
                     result = await crawler.arun(url=url)
 
                     if result.markdown:
                         # Clean up the markdown before saving
                         cleaned_markdown = result.clean_markdown()
 
-                        # Generate filename using the same convention as crawl-sequential.py
-                        filename = generate_filename(url, index, timestamp, OUTPUT_FILE_PREFIX)
-                        output_file = output_dir / filename
-
                         # Write the cleaned markdown content to file
                         output_file.write_text(cleaned_markdown)
-                        print(f"✓ Successfully saved to: {output_file}")
+                        logger.info("✓ Successfully saved to: %s", output_file)
                     else:
-                        print("✗ Failed: No content retrieved")
+                        logger.warning("✗ Failed: No content retrieved")
 
                 except asyncio.TimeoutError as e:
-                    print(f"✗ Timeout error crawling {url}: {str(e)}")
+                    logger.error("✗ Timeout error crawling %s: %s", url, e)
                 except IOError as e:
-                    print(f"✗ File operation error for {url}: {str(e)}")
+                    logger.error("✗ File operation error for %s: %s", url, e)
                 except Exception as e:  # pylint: disable=broad-except
                     # Keep the broad exception as a fallback, but with a pylint disable comment
-                    print(f"✗ Error crawling {url}: {str(e)}")
+                    logger.error("✗ Error crawling %s: %s", url, e)
 
     except PermissionError as e:
-        print(f"✗ Permission error creating directories: {str(e)}")
+        logger.error("✗ Permission error creating directories: %s", e)
         return 1
     except Exception as e:  # pylint: disable=broad-except
-        print(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return 1
     return 0
 
@@ -86,5 +94,5 @@ if __name__ == "__main__":
     try:
         sys.exit(asyncio.run(main()))
     except KeyboardInterrupt:
-        print("\nOperation cancelled by user")
+        logger.info("Operation cancelled by user")
         sys.exit(1)
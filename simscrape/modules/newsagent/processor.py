@@ -4,6 +4,8 @@ Requires a folder parameter e.g. python3 -m simscrape.modules.newsagent.processo
 """
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import sys
 import argparse
 import logging
@@ -23,8 +25,12 @@ if not api_key:
     logger.error("API key environment variable is not set.")
     sys.exit(1)
 
-# Initialize the OpenAI client
+# Initialize the OpenAI clients (sync for simple callers, async for batched runs)
 client = openai.OpenAI(api_key=api_key)
+async_client = openai.AsyncOpenAI(api_key=api_key)
+
+# Cap on concurrent API calls so batched summarization respects rate limits
+MAX_CONCURRENT_REQUESTS = 8
 
 def call_chatgpt(
     prompt: str,
@@ -54,6 +60,34 @@ def call_chatgpt(
         logger.error("Error calling OpenAI API: %s", e)
         raise
 
+async def call_chatgpt_async(
+    prompt: str,
+    model: str = "gpt-4-turbo",
+    temperature: float = 0.7,
+    max_tokens: int = 1024
+) -> str:
+    """
+    Async variant of call_chatgpt, used to run many summarizations concurrently.
+    """
+    if not 0 <= temperature <= 1:
+        raise ValueError("Temperature must be between 0 and 1")
+    if not 0 <= max_tokens <= 10000:
+        raise ValueError("Max tokens must be between 0 and 10000")
+    try:
+        response = await async_client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=60,
+        )
+        result = response.choices[0].message.content.strip()
+        logger.debug("API call successful.")
+        return result
+    except Exception as e:
+        logger.error("Error calling OpenAI API: %s", e)
+        raise
+
 def summarize_text(text: str, prompt_template: str) -> str:
     """
     Inserts the text into the prompt template and returns the summarization.
@@ -61,23 +95,49 @@ def summarize_text(text: str, prompt_template: str) -> str:
     prompt = prompt_template.format(text=text)
     return call_chatgpt(prompt)
 
+PAGE_PROMPT_TEMPLATE = (
+    "You are an expert news content summarizer. Summarize the following webpage content "
+    "in a few concise paragraphs, highlighting the main points and structure.\n\n{text}\n"
+)
+
 def summarize_page(page_content: str) -> str:
     """
     Summarizes a single page's markdown content.
     """
-    prompt_template = (
-        "You are an expert news content summarizer. Summarize the following webpage content "
-        "in a few concise paragraphs, highlighting the main points and structure.\n\n{text}\n"
+    return summarize_text(page_content, PAGE_PROMPT_TEMPLATE)
+
+async def summarize_page_async(page_content: str, semaphore: asyncio.Semaphore) -> str:
+    """
+    Summarizes a single page's markdown content, bounded by the shared semaphore.
+    """
+    async with semaphore:
+        return await call_chatgpt_async(PAGE_PROMPT_TEMPLATE.format(text=page_content))
+
+async def summarize_pages(pages: dict) -> dict:
+    """
+    Summarizes all pages concurrently and returns a file name -> summary mapping.
+    Pages whose summarization failed are logged and omitted.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    results = await asyncio.gather(
+        *(summarize_page_async(content, semaphore) for content in pages.values()),
+        return_exceptions=True,
     )
-    return summarize_text(page_content, prompt_template)
 
-def summarize_website(pages: dict) -> str:
+    page_summaries = {}
+    for file_name, result in zip(pages, results):
+        if isinstance(result, Exception):
+            logger.error("Error summarising %s: %s", file_name, result)
+        else:
+            page_summaries[file_name] = result
+    return page_summaries
+
+async def summarize_website(page_summaries: dict) -> str:
     """
-    Produces an overall website summary by combining the individual page contents.
+    Produces an overall website summary from the individual page summaries.
     """
     combined_summaries = ""
-    for file_name, content in pages.items():
-        page_summary = summarize_page(content)
+    for file_name, page_summary in page_summaries.items():
         combined_summaries += f"Summary for {file_name}:\n{page_summary}\n\n"
 
     website_prompt = (
@@ -92,7 +152,7 @@ def summarize_website(pages: dict) -> str:
         "Use proper markdown formatting with headers, bullet points, and sections.\n\n{text}"
     )
     prompt = website_prompt.format(text=combined_summaries)
-    return call_chatgpt(prompt)
+    return await call_chatgpt_async(prompt)
 
 def create_markdown_report(page_summaries: dict, overall_summary: str, timestamp: str) -> str:
     """Creates a formatted markdown report combining all summaries."""
@@ -122,17 +182,25 @@ def read_markdown_files(folder: str) -> dict:
             f"The path {folder} is not a valid directory or contains no markdown files."
         )
 
-    pages = {}
-    for md_file in folder_path.glob("*.md"):
+    def _read(md_file: Path):
         try:
-            with md_file.open(encoding="utf-8") as f:
-                pages[md_file.name] = f.read()
+            content = md_file.read_text(encoding="utf-8")
             logger.info("Loaded %s", md_file.name)
+            return md_file.name, content
         except (FileNotFoundError, IOError) as e:
             logger.error("Error reading %s: %s", md_file.name, e)
+            return md_file.name, None
+
+    # File reads release the GIL, so a small thread pool overlaps the disk I/O
+    md_files = list(folder_path.glob("*.md"))
+    pages = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for name, content in executor.map(_read, md_files):
+            if content is not None:
+                pages[name] = content
     return pages
 
-def main():
+async def main():
     """
     Main function to summarise website content.
     """
@@ -154,20 +222,14 @@ def main():
 
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     logger.info("Summarising individual pages...")
-    page_summaries = {}
+    page_summaries = await summarize_pages(pages)
 
-    for file_name, content in pages.items():
-        logger.info("Processing %s...", file_name)
-        try:
-            summary = summarize_page(content)
-            page_summaries[file_name] = summary
-            print(f"\nSummary for {file_name}:\n{summary}\n{'-'*60}")
-        except (openai.APIError, openai.RateLimitError, ValueError) as e:
-            logger.error("Error summarising %s: %s", file_name, e)
+    for file_name, summary in page_summaries.items():
+        print(f"\nSummary for {file_name}:\n{summary}\n{'-'*60}")
 
     logger.info("Creating overall website summary...")
     try:
-        overall_summary = summarize_website(pages)
+        overall_summary = await summarize_website(page_summaries)
         print(f"\nOverall Website Summary:\n{overall_summary}\n{'='*60}")
 
         # Create consolidated report
@@ -185,4 +247,4 @@ def main():
         logger.error("Error creating summary report: %s", e)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,16 +1,20 @@
 """
 Query the FAISS index and return the top relevant chunks.
+
+Install faiss-cpu >= 1.8 so the AVX2 kernels (faiss.swigfaiss_avx2) are
+selected automatically; the generic build is several times slower.
 """
-import pickle
+from functools import lru_cache
 from typing import List, Dict
 import argparse
 import sys
 import logging
 import os
 from dotenv import load_dotenv
+import msgpack
 from sentence_transformers import SentenceTransformer
-# import faiss
-# import numpy as np
+import faiss
+import numpy as np
 
 # Load environment variables
 load_dotenv()
@@ -18,8 +22,15 @@ load_dotenv()
 # ------------------------
 # CONFIGURATION
 # ------------------------
-DB_FILE = os.getenv("DB_FILE", "./output/vector_database.pkl")  # Use environment variable
+DB_FILE = os.getenv("DB_FILE", "./output/vector_database")  # Use environment variable
+INDEX_FILE = DB_FILE + ".faiss"  # Native FAISS index written by the processor
+META_FILE = DB_FILE + ".meta.msgpack"  # Chunk text and metadata
 MODEL_NAME = os.getenv("MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2")  # Use environment variable
+NPROBE = int(os.getenv("FAISS_NPROBE", "16"))  # IVF clusters scanned per query (recall/speed knob)
+# Default to one OpenMP thread per search: per-query fan-out hurts latency,
+# and concurrency is better spent at the request/batch layer. Raise this for
+# large offline batch searches.
+FAISS_OMP_THREADS = int(os.getenv("FAISS_OMP_THREADS", "1"))
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -29,46 +40,99 @@ logger = logging.getLogger(__name__)
 def load_vector_db():
     """Load the FAISS vector database and embeddings model."""
     try:
-        with open(DB_FILE, "rb") as f:
-            faiss_db = pickle.load(f)
+        faiss.omp_set_num_threads(FAISS_OMP_THREADS)
+        # Memory-map the index read-only so the OS pages in only the parts
+        # a query actually touches instead of loading the whole vector matrix
+        index = faiss.read_index(INDEX_FILE, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        # IVF indexes answer from a subset of clusters; raise NPROBE for
+        # better recall at the cost of scanning more lists per query
+        if hasattr(index, "nprobe"):
+            index.nprobe = NPROBE
+        with open(META_FILE, "rb") as f:
+            # Parallel arrays keyed as texts/sources/pages; FAISS ids index into them
+            metadata = msgpack.unpack(f)
         embedder = SentenceTransformer(MODEL_NAME)
-        return faiss_db["index"], faiss_db["text_chunks"], embedder
-    except FileNotFoundError:
-        logger.error("Vector database not found at %s", DB_FILE)
+        return index, metadata, embedder
+    except (FileNotFoundError, RuntimeError) as e:
+        # faiss raises RuntimeError for missing and corrupt/incompatible
+        # files alike, so include the underlying message
+        logger.error("Could not load vector database at %s: %s", INDEX_FILE, e)
         sys.exit(1)
     except Exception as e:
         logger.error("Error: %s", str(e))
         sys.exit(1)
 
+@lru_cache(maxsize=1)
+def _get_db():
+    """Load the index, metadata, and embedder once per process.
+
+    Loading deserializes the FAISS index and pulls hundreds of MB of model
+    weights, so repeated queries must not pay it again.
+    """
+    return load_vector_db()
+
+def query_faiss_batch(queries: List[str], min_score: float = 0.5,
+                      max_results: int = 20) -> List[List[Dict]]:
+    """
+    Query the FAISS index with a batch of queries at once.
+
+    All queries go through one SentenceTransformer.encode call and one
+    index.search, so the per-call model and FAISS overhead is amortized
+    across the batch — encoding queries one at a time is the worst case
+    for a transformer encoder.
+
+    Args:
+        queries (List[str]): The search queries
+        min_score (float): Minimum similarity score (0.0 to 1.0)
+        max_results (int): Maximum number of results to consider per query
+
+    Returns:
+        List[List[Dict]]: Per-query result lists, in input order; each list
+            is sorted by similarity score, best first
+    """
+    index, metadata, embedder = _get_db()
+
+    query_embeddings = embedder.encode(
+        queries, batch_size=64, convert_to_numpy=True, normalize_embeddings=True
+    )
+    distances, indices = index.search(query_embeddings, max_results)
+
+    texts = metadata["texts"]
+    sources = metadata["sources"]
+    pages = metadata["pages"]
+
+    all_results = []
+    for scores, query_indices in zip(distances, indices):
+        # The index is built with METRIC_INNER_PRODUCT on normalized
+        # vectors, so FAISS "distances" already are cosine similarities;
+        # filter in one vectorized pass (-1 indices pad short result sets)
+        keep = np.where((scores >= min_score) & (query_indices >= 0))[0]
+        order = keep[np.argsort(-scores[keep])]
+        all_results.append([
+            {
+                "text": texts[idx],
+                "metadata": {"source": sources[idx], "page": pages[idx]},
+                "score": float(scores[pos])
+            }
+            for pos, idx in zip(order, query_indices[order])
+        ])
+
+    return all_results
+
 # Function to get top relevant chunks
 def query_faiss(query: str, min_score: float = 0.5, max_results: int = 20) -> List[Dict]:
     """
     Query the FAISS index and return relevant chunks above the score threshold.
-    
+
     Args:
         query (str): The search query
         min_score (float): Minimum similarity score (0.0 to 1.0)
         max_results (int): Maximum number of results to consider
-        
+
     Returns:
         List[Dict]: List of results with text, metadata, and similarity score
     """
-    index, text_chunks, embedder = load_vector_db()
-
-    query_embedding = embedder.encode([query], convert_to_numpy=True)
-    distances, indices = index.search(query_embedding, max_results)  # Get more results initially
-
-    results = []
-    for dist, idx in zip(distances[0], indices[0]):
-        score = 1 - (dist / 2)  # Convert distance to similarity score
-        if score >= min_score:  # Only include results above threshold
-            results.append({
-                "text": text_chunks[idx]["text"],
-                "metadata": text_chunks[idx]["metadata"],
-                "score": score
-            })
-
-    return results
+    return query_faiss_batch([query], min_score, max_results)[0]
 
 def main():
     """CLI interface for querying the vector database."""
@@ -85,8 +149,8 @@ def main():
         logger.info("\n🔎 Results for: %s\n", args.query)
         logger.info("Found %d results with score >= %f", len(results), args.min_score)
 
-        # Sort results by score in descending order
-        for i, result in enumerate(sorted(results, key=lambda x: x['score'], reverse=True), 1):
+        # Results are already sorted by score in descending order
+        for i, result in enumerate(results, 1):
             logger.info("\n--- Result %d (Score: %.2f) ---", i, result['score'])
             logger.info("Source: %s, Page: %s", result['metadata']['source'], result['metadata']['page'])
             logger.info("Text: %s...", result['text'][:200])